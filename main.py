@@ -3,12 +3,56 @@ A text-based zombie survival game wherein the player has to reach
 the hospital whilst evading zombies.
 """
 
-from typing import Tuple, Optional, Dict, List
+import sys
+from typing import Tuple, Optional, Dict, List, Iterator
 
 from main_support import *
 
 # Author: Abdullah Shafqat
 
+# the offset for each movement direction, created once and shared
+# since positions are never modified after construction
+_OFFSETS: Dict[str, Position] = {UP: Position(0, -1), DOWN: Position(0, 1),
+                                 LEFT: Position(-1, 0), RIGHT: Position(1, 0)}
+
+# the (x, y) offsets a tracking zombie can move by, each paired with its
+# rank in the order of preference between equally good directions:
+# ‘W’ first followed by ‘S’, ‘N’, and finally ‘E’
+_TRACK_OFFSETS: Tuple[Tuple[int, int, int], ...] = ((-1, 0, 0), (0, 1, 1),
+                                                    (0, -1, 2), (1, 0, 3))
+
+# positions handed out by the game, interned by their (x, y) coordinates
+# so the same cell is only ever built once; safe to share since
+# positions are never modified after construction
+_POSITIONS: Dict[Tuple[int, int], Position] = {}
+
+def _position(x: int, y: int) -> Position:
+    """
+    Return the shared position at (x, y), creating it the first time.
+
+    Parameters:
+        x: The x coordinate of the position.
+        y: The y coordinate of the position.
+    """
+    position = _POSITIONS.get((x, y))
+
+    if position is None:
+        position = _POSITIONS[(x, y)] = Position(x, y)
+
+    return position
+
+# the character code kept for a cell whose entity has no single ASCII
+# display character (e.g. an abstract Entity), such cells fall back to
+# calling display when the grid is serialized or drawn
+_UNDRAWN = 0
+
+# integer tags identifying the kind of an entity, compared on the hot
+# paths of the game instead of calling isinstance
+ENTITY_TYPE = 0
+PLAYER_TYPE = 1
+HOSPITAL_TYPE = 2
+ZOMBIE_TYPE = 3
+
 class Entity:
     """
     Entity is an abstract class that is used to represent
@@ -17,6 +61,25 @@ class Entity:
     For example, the game grid will always have a player,
     so a player is considered a type of entity.
     """
+
+    __slots__ = ()
+
+    # the character used to represent the entity in a text-based grid,
+    # defined by each subclass that can be placed in the grid
+    DISPLAY: str = None
+    # the type tag of the entity, inherited by subclasses of the same kind
+    TYPE_ID: int = ENTITY_TYPE
+    # whether the entity does anything during the step event, worked
+    # out for each subclass from whether it overrides the step method
+    ACTIVE: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Records whether every subclass of Entity overrides the step method
+        when it is defined, so that the game only steps those entities.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.ACTIVE = cls.step is not Entity.step
     
     def step(self, position: "Position", game: "Game") -> None:
         """
@@ -47,8 +110,17 @@ class Entity:
 
         The abstract Entity class should raise a NotImplementedError for
         this method.
+
+        Examples:
+            >>> Player().display()
+            'P'
+            >>> Zombie().display()
+            'Z'
         """
-        raise NotImplementedError
+        if self.DISPLAY is None:
+            raise NotImplementedError
+
+        return self.DISPLAY
     
     def __repr__(self) -> str:
         """
@@ -81,20 +153,12 @@ class Player(Entity):
         >>> player
         Player()
     """
-    
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        player entity in a text-based grid.
-        
-        A player should be represented by the ‘P’ character.
 
-        Examples:
-            >>> player = Player()
-            >>> player.display()
-            'P'
-        """
-        return PLAYER
+    __slots__ = ()
+
+    # a player is represented by the ‘P’ character
+    DISPLAY = PLAYER
+    TYPE_ID = PLAYER_TYPE
     
     def __repr__(self) -> str:
         """
@@ -122,20 +186,12 @@ class Hospital(Entity):
         >>> hospital
         Hospital()
     """
-    
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        hospital entity in a text-based grid.
-        
-        A hospital should be represented by the ‘H’ character.
 
-        Examples:
-            >>> player = Player()
-            >>> player.display()
-            'H'
-        """
-        return HOSPITAL
+    __slots__ = ()
+
+    # a hospital is represented by the ‘H’ character
+    DISPLAY = HOSPITAL
+    TYPE_ID = HOSPITAL_TYPE
     
 ##    def __repr__(self) -> str:
 ##        """
@@ -143,6 +199,10 @@ class Hospital(Entity):
 ##        """
 ##        return "Hospital()"
 
+# hospitals hold no state of their own, so every hospital
+# loaded from a map file shares this single instance
+_SHARED_HOSPITAL = Hospital()
+
 
 class Grid:
     """
@@ -171,10 +231,20 @@ class Grid:
 
     # the size of the grid
     size:int = None
-    # the list of current entities in the grid
-    entities:List[Entity] = None
     # the dictionary of entities along with their locations in the grid
     EntityLocations:Dict[Tuple[int, int], Entity] = None
+    # the display character code of every cell, stored row by row
+    _chars:List[bytearray] = None
+    # the (x, y) location of the player, only relied on while there is
+    # exactly one player, None when it is not known
+    _player_pos:Optional[Tuple[int, int]] = None
+    # the number of players currently in the grid
+    _player_count:int = None
+    # the number of hospitals currently in the grid
+    _hospital_count:int = None
+    # the entities that act during the step event along with their
+    # locations, kept in the same order as EntityLocations
+    _active:Dict[Tuple[int, int], Entity] = None
     
     def __init__(self, size: int):
         """
@@ -188,7 +258,11 @@ class Grid:
         # initializing all the class variables
         self.size = size
         self.EntityLocations = {}
-        self.entities = []
+        self._chars = [bytearray(b" " * size) for _ in range(size)]
+        self._player_pos = None
+        self._player_count = 0
+        self._hospital_count = 0
+        self._active = {}
         
     def get_size(self) -> int:
         """
@@ -215,11 +289,21 @@ class Grid:
             >>> grid5.in_bounds(Position(0, 4))
             True 
         """
-        if(0 <= position.get_x() < self.size and
-           0 <= position.get_y() < self.size):
-            return True
-        else:
-            return False
+        return self.in_bounds_xy(position.get_x(), position.get_y())
+
+    def in_bounds_xy(self, x: int, y: int) -> bool:
+        """
+        Return True if the given x and y coordinates are
+        within the bounds of the grid.
+
+        Works the same as in_bounds but takes the coordinates directly,
+        so that no Position instance has to be created for the check.
+
+        Parameters:
+            x: The x coordinate to check.
+            y: The y coordinate to check.
+        """
+        return 0 <= x < self.size and 0 <= y < self.size
         
     def add_entity(self, position: "Position", entity: "Entity") -> None:
         """
@@ -239,24 +323,100 @@ class Grid:
             >>> grid = Grid(4)
             >>> grid.add_entity(Position(0, 0), Player()) 
         """
+        self.add_entity_xy(position.get_x(), position.get_y(), entity)
+
+    def add_entity_xy(self, x: int, y: int, entity: "Entity") -> None:
+        """
+        Place a given entity at the given x and y coordinates of the grid.
+
+        Works the same as add_entity but takes the coordinates directly.
+
+        Parameters:
+            x: The x coordinate to place the entity at.
+            y: The y coordinate to place the entity at.
+            entity: The entity to place on the grid.
+        """
         # if position out of bounds return
-        if self.in_bounds(position) == False:
+        if not self.in_bounds_xy(x, y):
             return None
 
+        # working out the display character before the grid is changed
+        char = self._display_code(entity)
+
         # removing the entity if any at the position where new
         # entity is to be added
         # using method 'pop' with optional parameter default equal to 'None'
-        entity_removed = self.EntityLocations.pop((position.get_x(), position.get_y()), None)
+        entity_removed = self.EntityLocations.pop((x, y), None)
+        self._active.pop((x, y), None)
+
+        if entity_removed is not None:
+            # forgetting the player's location if the player was replaced
+            if entity_removed.TYPE_ID == PLAYER_TYPE:
+                self._player_pos = None
+                self._player_count -= 1
 
-        if entity_removed != None:
-            # removing the entity previously at postion
-            # if any from the entities list
-            self.entities.remove(entity_removed)
+            elif entity_removed.TYPE_ID == HOSPITAL_TYPE:
+                self._hospital_count -= 1
 
         # adding the entity to the dictionary of locations
-        # as well as to the list of entities
-        self.EntityLocations.update({(position.get_x(), position.get_y()):entity})
-        self.entities.append(entity)
+        self.EntityLocations.update({(x, y):entity})
+
+        if entity.TYPE_ID == PLAYER_TYPE:
+            self._player_pos = (x, y)
+            self._player_count += 1
+
+        elif entity.TYPE_ID == HOSPITAL_TYPE:
+            self._hospital_count += 1
+
+        if entity.ACTIVE:
+            self._active[(x, y)] = entity
+
+        self._chars[y][x] = char
+
+    def _display_code(self, entity: "Entity") -> int:
+        """
+        Return the character code to store for the given entity's cell.
+
+        Entities that cannot be displayed yet, or whose display is not a
+        single ASCII character, are stored as _UNDRAWN so that adding them
+        behaves as it did before the characters were cached.
+
+        Parameters:
+            entity: The entity about to be placed on the grid.
+        """
+        try:
+            char = entity.display()
+        except NotImplementedError:
+            return _UNDRAWN
+
+        if isinstance(char, str) and len(char) == 1 and ord(char) < 128:
+            return ord(char)
+
+        return _UNDRAWN
+
+    def row_text(self, y: int) -> str:
+        """
+        Return the display characters of the given row as a string,
+        with a space for every empty cell.
+
+        Parameters:
+            y: The y coordinate of the row.
+
+        Examples:
+            >>> grid = Grid(4)
+            >>> grid.add_entity(Position(2, 1), Player())
+            >>> grid.row_text(1)
+            '  P '
+        """
+        row = self._chars[y]
+
+        if _UNDRAWN not in row:
+            return row.decode()
+
+        # asking the entities that have no cached character directly
+        return "".join(self.EntityLocations[(x, y)].display()
+                       if char == _UNDRAWN else chr(char)
+                       for x, char in enumerate(row))
         
     def remove_entity(self, position: "Position") -> None:
         """
@@ -271,19 +431,36 @@ class Grid:
             >>> grid.add_entity(Position(0, 0), Player())
             >>> grid.remove_entity(Position(0, 0))
         """
-        # if position is out of bounds return
+        self.remove_entity_xy(position.get_x(), position.get_y())
+
+    def remove_entity_xy(self, x: int, y: int) -> None:
+        """
+        Remove the entity, if any, at the given x and y coordinates.
+
+        Works the same as remove_entity but takes the coordinates directly.
 
-        if self.in_bounds(position) == False:
+        Parameters:
+            x: The x coordinate of the entity to remove.
+            y: The y coordinate of the entity to remove.
+        """
+        # if position is out of bounds return
+        if not self.in_bounds_xy(x, y):
             return None
 
         # removing the entity if any at the position if any
         # using method 'pop' with optional parameter default equal to 'None'
-        entity_at_position = self.EntityLocations.pop((position.get_x(), position.get_y()), None)
+        entity_at_position = self.EntityLocations.pop((x, y), None)
+        self._active.pop((x, y), None)
+
+        if entity_at_position is not None:
+            self._chars[y][x] = ord(" ")
 
-        if entity_at_position != None:
-            # removing the entity previously at postion
-            # if any from the entities list
-            self.entities.remove(entity_at_position)
+            if entity_at_position.TYPE_ID == PLAYER_TYPE:
+                self._player_pos = None
+                self._player_count -= 1
+
+            elif entity_at_position.TYPE_ID == HOSPITAL_TYPE:
+                self._hospital_count -= 1
 
     def get_entity(self, position: "Position") -> Optional[Entity]:
         """
@@ -303,12 +480,24 @@ class Grid:
             Player()
             >>> grid.get_entity(Position(1, 1)) 
         """
-        if self.in_bounds(position) == False:
+        return self.get_entity_xy(position.get_x(), position.get_y())
+
+    def get_entity_xy(self, x: int, y: int) -> Optional[Entity]:
+        """
+        Return the entity that is at the given x and y coordinates.
+
+        Works the same as get_entity but takes the coordinates directly.
+
+        Parameters:
+            x: The x coordinate of the entity.
+            y: The y coordinate of the entity.
+        """
+        if not self.in_bounds_xy(x, y):
             return None
 
         # getting the entity at defined position
         # using method 'get' with optional parameter default equal to 'None'
-        return self.EntityLocations.get((position.get_x(), position.get_y()), None)
+        return self.EntityLocations.get((x, y), None)
          
     def get_mapping(self) -> Dict[Position, Entity]:
         """
@@ -346,7 +535,25 @@ class Grid:
             >>> grid.get_entities()
             [Hospital(), Player()]
         """
-        return self.entities
+        # the entities are derived from the dictionary of locations
+        # so that there is no separate list to keep in sync
+        return list(self.EntityLocations.values())
+
+    def get_active_entities(self) -> List[Tuple[Tuple[int, int], Entity]]:
+        """
+        Return the entities in the grid that act during the step event,
+        each paired with its (x, y) location, in the same order as
+        get_entities.
+
+        Examples:
+            >>> grid = Grid(5)
+            >>> grid.add_entity(Position(0, 0), Hospital())
+            >>> grid.add_entity(Position(0, 1), Zombie())
+            >>> grid.get_active_entities()
+            [((0, 1), Zombie())]
+        """
+        # a snapshot, so entities can move while it is iterated over
+        return list(self._active.items())
     
     def move_entity(self, start: "Position", end: "Position") -> None:
         """
@@ -374,29 +581,114 @@ class Grid:
             >>> grid.get_entity(Position(3, 5))
             Player()
         """
-        # checking for out of bounds
-        if self.in_bounds(start) == False or self.in_bounds(end) == False:
+        return self.move_entity_xy(start.get_x(), start.get_y(),
+                                   end.get_x(), end.get_y())
+
+    def move_entity_xy(self, start_x: int, start_y: int,
+                       end_x: int, end_y: int) -> None:
+        """
+        Moves an entity from the given start coordinates
+        to the given end coordinates.
+
+        Works the same as move_entity but takes the coordinates directly.
+
+        Parameters:
+            start_x: The x coordinate the entity is at initially.
+            start_y: The y coordinate the entity is at initially.
+            end_x: The x coordinate to which the entity will be moved.
+            end_y: The y coordinate to which the entity will be moved.
+        """
+        # checking for out of bounds, inlined since moving
+        # is the most frequent change made to the grid
+        size = self.size
+        if not (0 <= start_x < size and 0 <= start_y < size and
+                0 <= end_x < size and 0 <= end_y < size):
             return None
 
         # removing the entity from the start position if any
         # if no entity exists this variable will hold None
-        entity_at_start = self.EntityLocations.pop((start.get_x(), start.get_y()),
-                                                   None)
+        entity_at_start = self.EntityLocations.pop((start_x, start_y), None)
 
-        if entity_at_start != None:
+        if entity_at_start is None:
+            return None
 
-            # using the remove_entity method to remove entity at end position
-            self.remove_entity(end)
-                
-            self.EntityLocations.update({(end.get_x(), end.get_y()):
-                                         entity_at_start})
+        # removing the entity at the end position if any, popped rather
+        # than overwritten so the moved entity ends up last in the
+        # dictionary, the same as an entity that was newly added
+        entity_at_end = self.EntityLocations.pop((end_x, end_y), None)
+        self.EntityLocations[(end_x, end_y)] = entity_at_start
+
+        if entity_at_end is not None:
+            # forgetting the replaced entity
+            if entity_at_end.TYPE_ID == PLAYER_TYPE:
+                self._player_pos = None
+                self._player_count -= 1
+
+            elif entity_at_end.TYPE_ID == HOSPITAL_TYPE:
+                self._hospital_count -= 1
+
+            self._active.pop((end_x, end_y), None)
+
+        if entity_at_start.TYPE_ID == PLAYER_TYPE:
+            self._player_pos = (end_x, end_y)
+
+        if entity_at_start.ACTIVE:
+            self._active.pop((start_x, start_y))
+            self._active[(end_x, end_y)] = entity_at_start
+
+        # moving the display character along with the entity
+        char = self._chars[start_y][start_x]
+        self._chars[start_y][start_x] = ord(" ")
+        self._chars[end_y][end_x] = char
         return None
     
+    def ray(self, start: "Position",
+            offset: "Position") -> Iterator[Tuple[int, int, Entity]]:
+        """
+        Yield the entities found by travelling from the given start
+        position in steps of the given offset, nearest first,
+        until the edge of the grid is reached.
+
+        Each entity is yielded along with its x and y coordinates.
+        Empty cells are skipped and the start position is not included,
+        so an offset of (0, 0) yields nothing.
+
+        Parameters:
+            start: The position to travel from.
+            offset: The change in position of each step.
+
+        Examples:
+            >>> grid = Grid(5)
+            >>> grid.add_entity(Position(0, 3), Zombie())
+            >>> list(grid.ray(Position(0, 0), Position(0, 1)))
+            [(0, 3, Zombie())]
+        """
+        dx, dy = offset.get_x(), offset.get_y()
+
+        # a ray that does not move would never reach the edge
+        if dx == 0 and dy == 0:
+            return
+
+        x, y = start.get_x() + dx, start.get_y() + dy
+
+        # binding the size and cell lookup once rather than per cell
+        size, get = self.size, self.EntityLocations.get
+
+        while 0 <= x < size and 0 <= y < size:
+            entity = get((x, y))
+
+            if entity is not None:
+                yield x, y, entity
+
+            x, y = x + dx, y + dy
+
     def find_player(self) -> Optional[Position]:
         """
         Return the position of the player within the grid.
 
         Return None if there is no player in the grid.
+        If there is more than one player, return the position of the
+        first one in the grid.
 
         Examples:
             >>> grid = Grid(10)
@@ -404,13 +696,38 @@ class Grid:
             >>> grid.find_player()
             Position(4, 6)
         """
-        for key, value in self.EntityLocations.items():
+        # the location of a lone player is kept up to date by the methods
+        # that add, remove and move entities
+        if self._player_count == 1 and self._player_pos is not None:
+            return _position(*self._player_pos)
+
+        # otherwise looking for the first player in the grid,
+        # and remembering its location if it is the only one
+        if self._player_count > 0:
+            for (x, y), entity in self.EntityLocations.items():
+                if entity.TYPE_ID == PLAYER_TYPE:
+                    if self._player_count == 1:
+                        self._player_pos = (x, y)
+
+                    return _position(x, y)
 
-            # if the value a instance of class Player
-            if isinstance(value, Player):
-                return Position(key[0], key[1])
-            
         return None
+
+    def has_hospital(self) -> bool:
+        """
+        Return true if there is at least one hospital in the grid.
+
+        Examples:
+            >>> grid = Grid(10)
+            >>> grid.has_hospital()
+            False
+            >>> grid.add_entity(Position(4, 6), Hospital())
+            >>> grid.has_hospital()
+            True
+        """
+        # the number of hospitals is kept up to date by the methods
+        # that add, remove and move entities
+        return self._hospital_count > 0
         
     def serialize(self) -> Dict[Tuple[int, int], str]:
         """
@@ -429,12 +746,16 @@ class Grid:
             {(3, 8): 'P’, (3, 20): ’H'}
         """
         return_dictionary = {}
-        
-        for key, value in self.EntityLocations.items():
-            
-            # calling the display function for the entities
-            # to get their character representation
-            return_dictionary.update({key:value.display()})
+
+        # scanning the display characters of every occupied cell
+        for y, row in enumerate(self._chars):
+            for x, char in enumerate(row):
+                if char == _UNDRAWN:
+                    return_dictionary[(x, y)] = (
+                        self.EntityLocations[(x, y)].display())
+
+                elif char != ord(" "):
+                    return_dictionary[(x, y)] = chr(char)
 
         return return_dictionary
 
@@ -474,12 +795,11 @@ class MapLoader:
         grid = Grid(loadedMap[1])
 
         # managing all the entities found in map file
-        for key, value in loadedMap[0].items():
+        for (x, y), token in loadedMap[0].items():
 
-            # creating a new entity 
-            entity = self.create_entity(value)
-            # adding the entity to the grid instance
-            grid.add_entity(Position(key[0], key[1]), entity)
+            # creating a new entity and adding it to the grid instance
+            # straight from its coordinates, without a Position
+            grid.add_entity_xy(x, y, self.create_entity(token))
             
         return grid
     
@@ -516,14 +836,13 @@ class BasicMapLoader(MapLoader):
         Raise ValueError if a token not representing Hospital
         or Player is recieved
         """
-        if token not in [PLAYER, HOSPITAL]:
-            raise ValueError
-
-        elif token == PLAYER:
+        if token == PLAYER:
             return Player()
 
         elif token == HOSPITAL:
-            return Hospital()
+            return _SHARED_HOSPITAL
+
+        raise ValueError
 
 
 class Game:
@@ -570,7 +889,7 @@ class Game:
         player_position = self.grid.find_player()
 
         # if the position for a player exists
-        if player_position != None:
+        if player_position is not None:
 
             # return the entity at the player_position
             return self.grid.get_entity(player_position)
@@ -591,9 +910,11 @@ class Game:
         # updating the number of steps that have occured in game
         self.no_steps += 1
 
-        # calling step for all entities in grid
-        for key, value in self.grid.get_mapping().items():
-            value.step(key, self)
+        # calling step for the entities in grid that act during the
+        # step event, in one pass over a snapshot of their locations
+        # taken before any of them move
+        for (x, y), entity in self.grid.get_active_entities():
+            entity.step(_position(x, y), self)
 
     def get_steps(self) -> int:
         """
@@ -644,20 +965,7 @@ class Game:
             Position(0, -1)
             >>> game.direction_to_offset("N") 
         """
-        if direction == UP:
-            return Position(0, -1)
-
-        elif direction == DOWN:
-            return Position(0, 1)
-
-        elif direction == LEFT:
-            return Position(-1, 0)
-
-        elif direction == RIGHT:
-            return Position(1, 0)
-
-        else:
-            return None
+        return _OFFSETS.get(direction)
 
     def has_won(self) -> bool:
         """
@@ -667,14 +975,9 @@ class Game:
         When the player steps on the hospital,
         there will be no hospital entity in the grid. 
         """
-        # checking if a hospital entity exists in the entities list
+        # checking if a hospital entity exists in the grid
         # if it does player has not won the game yet
-        for entity in self.grid.entities:
-
-            if(repr(entity) == "Hospital()"):
-                return False
-
-        return True
+        return not self.grid.has_hospital()
 
     def has_lost(self) -> bool:
         """
@@ -696,6 +999,8 @@ class TextInterface(GameInterface):
     """
     
     size:int = None
+    # the top and bottom border line, which only depends on the size
+    _border_line:str = None
     
     def __init__(self, size: int):
         """
@@ -707,6 +1012,7 @@ class TextInterface(GameInterface):
             size: The size of the game to be displayed and played. 
         """
         self.size = size
+        self._border_line = BORDER * (size + 2)
 
     def draw(self, game: "Game") -> None:
         """
@@ -732,24 +1038,21 @@ class TextInterface(GameInterface):
         """
         grid = game.get_grid()
 
-        # printing the top border
-        print(BORDER * (self.size + 2))
-
-        for j in range(self.size):
-            # printing the left border
-            print(BORDER, end = '')
+        # the top border
+        lines = [self._border_line]
 
-            # printing the game grid
-            for i in range(self.size):
-                # getting the value from serialized grid
-                # with default parameter set to a empty space lietral
-                print(grid.serialize().get((i,j), ' '), end = '')
+        # each row of the grid already holds the display characters
+        # of its cells, so it only needs to be fitted to the size of
+        # the interface and wrapped in borders
+        for y in range(self.size):
+            row = grid.row_text(y) if y < grid.get_size() else ""
+            lines.append(BORDER + row[:self.size].ljust(self.size) + BORDER)
 
-            # printing the right border
-            print(BORDER)
+        # the bottom border
+        lines.append(self._border_line)
 
-        # printing the bottom border  
-        print(BORDER * (self.size + 2))
+        # writing the whole frame at once
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def play(self, game: "Game") -> None:
         """
@@ -772,11 +1075,11 @@ class TextInterface(GameInterface):
 
             # checking for win or lose conditions
             # if either one is true break from game loop
-            if game.has_won() == True:
+            if game.has_won():
                 print(WIN_MESSAGE)
                 break
             
-            elif game.has_lost() == True:
+            elif game.has_lost():
                 print(LOSE_MESSAGE)
                 break
             
@@ -799,7 +1102,7 @@ class TextInterface(GameInterface):
         offset_position = game.direction_to_offset(action)
 
         # if the string input was valid
-        if offset_position != None:
+        if offset_position is not None:
             # move the player
             game.move_player(offset_position)
 
@@ -824,8 +1127,10 @@ class VulnerablePlayer(Player):
         >>> player.is_infected()
         True
     """
-    
-    infected: bool = None
+
+    __slots__ = ("infected",)
+
+    infected: bool
     
     def __init__(self):
         """
@@ -856,6 +1161,12 @@ class Zombie(Entity):
     The movement of a zombie is triggered by the player performing an action,
     i.e. the zombie moves during each step event. 
     """
+
+    __slots__ = ()
+
+    # a zombie is represented by the ‘Z’ character
+    DISPLAY = ZOMBIE
+    TYPE_ID = ZOMBIE_TYPE
     
     def step(self, position: "Position", game: "Game") -> None:
         """
@@ -874,48 +1185,44 @@ class Zombie(Entity):
                         step event is triggered.
             game: The current game being played.
         """
-        # getting a list of random directions
-        rnd_directions = random_directions()
         grid = game.get_grid()
-        
-        for i in range(len(rnd_directions)):
-            
-            direction = rnd_directions[i]
+        size = grid.get_size()
+        x, y = position.get_x(), position.get_y()
+
+        # trying each direction from a list of random directions
+        for dx, dy in random_directions():
 
             # the final position to be moved to is the zombies' current position
             # plus the offset from the random directions
-            final_position = position.add(Position(direction[0],direction[1]))
+            final_x, final_y = x + dx, y + dy
 
             # if final position out of bounds try the next random direction
-            if grid.in_bounds(final_position) == False:
+            if not (0 <= final_x < size and 0 <= final_y < size):
                 continue
 
+            # looking up the neighbouring cell only once, it is already
+            # known to be in bounds
+            entity = grid.EntityLocations.get((final_x, final_y))
+
             # if there is no entity at final position, move the zombie
-            if grid.get_entity(final_position) == None:
-                grid.move_entity(position, final_position)
+            if entity is None:
+                grid.move_entity_xy(x, y, final_x, final_y)
                 return None
 
             # if there is a Player entity at final position
             # do not move the zombie but infect the player
-            if isinstance(grid.get_entity(final_position), Player):
-                game.get_player().infect()   
+            # the entity found there already is the player,
+            # so it does not need to be looked up again
+            if entity.TYPE_ID == PLAYER_TYPE:
+                entity.infect()
                 return None
 
         return None
 
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        zombie entity in a text-based grid.
-        
-        A zombie should be represented by the ‘Z’ character.
 
-        Examples:
-            >>> zombie = Zombie()
-            >>> zombie.display()
-            'Z'
-        """
-        return ZOMBIE
+# zombies hold no state of their own, so every zombie
+# loaded from a map file shares this single instance
+_SHARED_ZOMBIE = Zombie()
 
     
 class IntermediateGame(Game):
@@ -964,18 +1271,17 @@ class IntermediateMapLoader(BasicMapLoader):
         Raise ValueError if a token not representing Hospital, Player
         or Zombie is recieved
         """
-        if token not in [PLAYER, ZOMBIE]:
-            # calling the super class function to handle entities
-            # other than zombie and player
-            # becaues they are same as before
-            return super().create_entity(token)
-
-        elif token == PLAYER:
+        if token == PLAYER:
             # create a instance of vulnerable player instead of simple player
             return VulnerablePlayer()
 
         elif token == ZOMBIE:
-            return Zombie()
+            return _SHARED_ZOMBIE
+
+        # calling the super class function to handle entities
+        # other than zombie and player
+        # becaues they are same as before
+        return super().create_entity(token)
 
 
 class TrackingZombie(Zombie):
@@ -985,6 +1291,11 @@ class TrackingZombie(Zombie):
     The TrackingZombie is a more intelligent type of zombie which
     is able to see the player and move towards them. 
     """
+
+    __slots__ = ()
+
+    # a tracking zombie is represented by the ‘T’ character
+    DISPLAY = TRACKING_ZOMBIE
     
     def step(self, position: "Position", game: "Game") -> None:
         """
@@ -1025,73 +1336,50 @@ class TrackingZombie(Zombie):
             causing an order of ‘S’, ‘E’, ‘W’, ‘N’ to be chosen.
 
         """
-        player_position = game.get_grid().find_player()
-
-        offsets_list:List[Position] = [Position(0, 1), Position(0, -1),
-                      Position(1, 0), Position(-1, 0)]
-
-        # list of direction of possible offsets
-        # corresponds directly to the order of offsets_list
-        directions_list:List[str] = ['S','N','E','W']
-
-        # list of distance of player when the zombie
-        # moves the corresponding offset in the offsets_list
-        distances_list:List[int] = []
-        
-        for offset in offsets_list:
-
-            # calculating the distance using the method in Position
-            distances_list.append(player_position.distance(offset.add(position)))
-
-        # combining all the three lists together to get a single 3D list
-        compressed_list: List[Position, int, str] = [list(a) for a in
-                     zip(offsets_list, distances_list, directions_list)]
-
-        # sorting the 3D list first on basic of
-        # decreasing distance the second element
-        # and in case of equal distance on basis of
-        # increasing direction character
-        compressed_list = sorted(compressed_list,key=lambda x: (-x[1], x[2]))
-
-        # reversing the list to obtains a properly sorted list per our needs
-        compressed_list.reverse()
-        
         grid = game.get_grid()
+        size = grid.get_size()
+        player_position = grid.find_player()
+        px, py = player_position.get_x(), player_position.get_y()
+        x, y = position.get_x(), position.get_y()
+
+        # a neighbouring player is always the best direction,
+        # so infect them straight away without ranking the offsets
+        if abs(px - x) + abs(py - y) == 1:
+            grid.get_entity_xy(px, py).infect()
+            return None
+
+        # sorting the offsets by the manhattan distance from the player
+        # that they would leave the zombie at, and in case of equal
+        # distance by their rank in the order of preference
+        sorted_offsets = sorted((abs(px - x - dx) + abs(py - y - dy),
+                                 rank, dx, dy)
+                                for dx, dy, rank in _TRACK_OFFSETS)
         
-        for i in range(len(compressed_list)):
+        for _, _, dx, dy in sorted_offsets:
             
-            final_position = position.add(compressed_list[i][0])
+            final_x, final_y = x + dx, y + dy
 
             # if the final position is out of bounds try the next direction
-            if grid.in_bounds(final_position) == False:
+            if not (0 <= final_x < size and 0 <= final_y < size):
                 continue
 
+            # looking up the neighbouring cell only once, it is already
+            # known to be in bounds
+            entity = grid.EntityLocations.get((final_x, final_y))
+
             # if no entity at final postion move the zombie
-            if grid.get_entity(final_position) == None:
-                grid.move_entity(position, final_position)
+            if entity is None:
+                grid.move_entity_xy(x, y, final_x, final_y)
                 return None
 
             # if the entity at final position is a Player
             # infect the player but do not move the zombie
-            if isinstance(grid.get_entity(final_position), Player):
-                game.get_player().infect()
+            if entity.TYPE_ID == PLAYER_TYPE:
+                entity.infect()
                 return None
             
         return None
     
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        tracking zombie entity in a text-based grid.
-        
-        A tracking zombie should be represented by the ‘T’ character.
-
-        Examples:
-            >>> tracking_zombie = TrackingZombie()
-            >>> tracking_zombie.display()
-            'T'
-        """
-        return TRACKING_ZOMBIE
 
 
 class Pickup(Entity):
@@ -1103,19 +1391,30 @@ class Pickup(Entity):
     A Pickup is a special type of entity that the player is able
     to pickup and hold in their inventory.
     """
-    
-    remaining_steps: int = None
+
+    __slots__ = ("remaining_steps",)
+
+    remaining_steps: int
+
+    # the maximum lifetime of the pickup, defined by each subclass
+    LIFETIME: int = None
+    # the class name used in the representation of the pickup
+    _NAME: str = "Pickup"
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Records the name of every subclass of Pickup when it is defined,
+        so that it does not have to be looked up for each representation.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
     
     def __init__(self):
         """
         A pickup entity initializes the lifetime of the entity
         to be equal to the maximum lifetime of that entity
         """
-        if(isinstance(self, Garlic) == True):
-            self.remaining_steps = LIFETIMES.get(GARLIC)
-
-        elif(isinstance(self, Crossbow) == True):
-            self.remaining_steps = LIFETIMES.get(CROSSBOW)
+        self.remaining_steps = self.LIFETIME
 
     def get_durability(self) -> int:
         """
@@ -1158,7 +1457,7 @@ class Pickup(Entity):
             >>> Crossbow().__repr__()
             'Crossbow(5)'
         """
-        return self.__class__.__name__ + "(" + str(self.remaining_steps) + ")"
+        return f"{self._NAME}({self.remaining_steps})"
 
 
 class Garlic(Pickup):
@@ -1172,6 +1471,12 @@ class Garlic(Pickup):
     If they collide with a zombie while holding a garlic,
     the zombie will perish.
     """
+
+    __slots__ = ()
+
+    # a garlic is represented by the ‘G’ character
+    DISPLAY = GARLIC
+    LIFETIME = LIFETIMES[GARLIC]
     
     def get_durability(self) -> int:
         """
@@ -1182,21 +1487,8 @@ class Garlic(Pickup):
         Returns:
             10
         """
-        return LIFETIMES.get(GARLIC)
+        return self.LIFETIME
 
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        garlic entity in a text-based grid.
-        
-        A garlic should be represented by the ‘G’ character.
-
-        Examples:
-            >>> garlic = Garlic()
-            >>> garlic.display()
-            'G'
-        """
-        return GARLIC
 
 class Crossbow(Pickup):
     """
@@ -1208,6 +1500,12 @@ class Crossbow(Pickup):
     to use the ﬁre action to launch a protectile in a given direction,
     removing the ﬁrst zombie in that direction. 
     """
+
+    __slots__ = ()
+
+    # a crossbow is represented by the ‘C’ character
+    DISPLAY = CROSSBOW
+    LIFETIME = LIFETIMES[CROSSBOW]
     
     def get_durability(self) -> int:
         """
@@ -1218,21 +1516,8 @@ class Crossbow(Pickup):
         Returns:
             5
         """
-        return LIFETIMES.get(CROSSBOW)
+        return self.LIFETIME
 
-    def display(self) -> str:
-        """
-        Return the character used to represent the
-        crossbow entity in a text-based grid.
-        
-        A crossbow should be represented by the ‘C’ character.
-
-        Examples:
-            >>> crossbow = Crossbow()
-            >>> crossbow.display()
-            'C'
-        """
-        return CROSSBOW
 
 
 class Inventory:
@@ -1246,8 +1531,10 @@ class Inventory:
     by being removed from the inventory.
     """
 
+    __slots__ = ("items",)
+
     # the list of items in the inventory
-    items: List[Pickup] = None
+    items: List[Pickup]
     
     def __init__(self):
         """
@@ -1275,14 +1562,22 @@ class Inventory:
             >>> inventory.get_items() 
             [Garlic(9), Crossbow(4)] 
         """
-        for item in self.items:
+        # whether any item's lifetime ran out during this step
+        expired = False
 
-            # holding the item for one play round
+        # holding every item for one play round
+        for item in self.items:
             item.hold()
 
-            # if lifetime is over remove it from inventory
-            if item.get_lifetime() <= 0:
-                self.items.remove(item)
+            if item.remaining_steps <= 0:
+                expired = True
+
+        # keeping only the items whose lifetime is not over, in a single
+        # pass rather than removing from the list while iterating over it,
+        # which is only needed on the steps where some item expired
+        if expired:
+            self.items[:] = [item for item in self.items
+                             if item.remaining_steps > 0]
         
     def add_item(self, item: "Pickup") -> None:
         """
@@ -1321,6 +1616,8 @@ class Inventory:
             >>> inventory.contains("G")
             True
         """
+        # checking the held items themselves, since the list returned
+        # by get_items can be changed directly
         for item in self.items:
             if pickup_id == item.display():
                 return True
@@ -1336,7 +1633,9 @@ class HoldingPlayer(VulnerablePlayer):
     In particular, a holding player will now keep an inventory. 
     """
 
-    inventory:Inventory = None
+    __slots__ = ("inventory",)
+
+    inventory: Inventory
 
     def __init__(self):
         """
@@ -1405,7 +1704,7 @@ class AdvancedGame(IntermediateGame):
         entity_endpos = self.grid.get_entity(end_position)
 
         # if the entity at the ending position is pickable
-        if isinstance(entity_endpos, Pickup) == True:
+        if isinstance(entity_endpos, Pickup):
 
             # add it to the inventory of player
             self.get_player().get_inventory().add_item(entity_endpos)
@@ -1413,6 +1712,16 @@ class AdvancedGame(IntermediateGame):
         self.grid.move_entity(start_position, end_position)
 
 
+# the classes the AdvancedMapLoader creates for the tokens it adds or
+# changes, any other token is handled by the IntermediateMapLoader
+_ADVANCED_ENTITY_CLASSES: Dict[str, type] = {
+    PLAYER: HoldingPlayer,
+    TRACKING_ZOMBIE: TrackingZombie,
+    GARLIC: Garlic,
+    CROSSBOW: Crossbow,
+}
+
+
 class AdvancedMapLoader(IntermediateMapLoader):
     """
     Inherits from IntermediateMapLoader
@@ -1441,21 +1750,14 @@ class AdvancedMapLoader(IntermediateMapLoader):
         Raise ValueError if a token not representing Hospital, Player,
         Zombie, TrackingZombie, Garlic or Crossbow is recieved
         """
-        if token not in [PLAYER, TRACKING_ZOMBIE, GARLIC, CROSSBOW]:
+        # looking up the class to create for the token
+        entity_class = _ADVANCED_ENTITY_CLASSES.get(token)
+
+        if entity_class is None:
             # call the superclass create_entity method
             return super().create_entity(token)
 
-        elif token == PLAYER:
-            return HoldingPlayer()
-
-        elif token == TRACKING_ZOMBIE:
-            return TrackingZombie()
-
-        elif token == GARLIC:
-            return Garlic()
-
-        elif token == CROSSBOW:
-            return Crossbow()
+        return entity_class()
 
 
 class AdvancedTextInterface(TextInterface):
@@ -1508,11 +1810,11 @@ class AdvancedTextInterface(TextInterface):
 
         if len(inventory_items) != 0:
 
-            print(HOLDING_MESSAGE)
-
-            for item in inventory_items:
-                # printing the representation of items
-                print(repr(item))
+            # writing the message and the representation of every item
+            # on separate lines all at once
+            lines = [HOLDING_MESSAGE]
+            lines.extend(repr(item) for item in inventory_items)
+            sys.stdout.write("\n".join(lines) + "\n")
 
     def handle_action(self, game: "Game", action: str) -> None:
         """
@@ -1551,19 +1853,21 @@ class AdvancedTextInterface(TextInterface):
             action: An action entered by the player during the game loop.
         """
 
-        # the game grid
-        grid = game.get_grid()
-        # the position at which currently checking for an entity
-        current_position = grid.find_player()
-        # the game player
-        player = game.get_player()
-        # the player inventory
-        inventory = player.get_inventory()
-
-        
         if action == FIRE:
+
+            # the player and the grid are only looked up when firing,
+            # movement is handled entirely by the superclass
+
+            # the game grid
+            grid = game.get_grid()
+            # the position at which currently checking for an entity
+            current_position = grid.find_player()
+            # the game player
+            player = game.get_player()
+            # the player inventory
+            inventory = player.get_inventory()
             
-            if inventory.contains(CROSSBOW) == True:
+            if inventory.contains(CROSSBOW):
 
                 # getting the user input for the direction to fire
                 fire_direction = input(FIRE_PROMPT)
@@ -1575,40 +1879,31 @@ class AdvancedTextInterface(TextInterface):
                 # If the firing direction is valid
                 else:
 
+                    # the offset of the fire direction, which does not
+                    # change while the projectile travels
+                    offset = game.direction_to_offset(fire_direction)
+
                     # finding the first entity starting from the player position
                     # in the fire direction
-                    while True:
-                        
-                        offset = game.direction_to_offset(fire_direction)
+                    for x, y, entity in grid.ray(current_position, offset):
 
-                        # updating the current position by adding to it the offset
-                        current_position = current_position.add(offset)
+                        # if the entity is either a Zombie or a Tracking Zombie,
+                        # which is itself a kind of Zombie, remove it from the grid
+                        if isinstance(entity, Zombie):
+                            grid.remove_entity_xy(x, y)
 
-                        # if the current position has gotten out of bounds
-                        # print the ‘No zombie in that direction!’ message
-                        # and break out of loop
-                        if grid.in_bounds(current_position) == False:
+                        # otherwise the first entity in the firing direction
+                        # is not a Zombie
+                        else:
                             print(NO_ZOMBIE_MESSAGE)
-                            break
-
-                        # the entity at the current position
-                        entity = grid.get_entity(current_position)
-
-                        # if the entity is either a Zombie or a Tracking Zombie
-                        # remove the zombie from the grid
-                        # and break out of loop
-                        if isinstance(entity, Zombie) or isinstance(entity, TrackingZombie):
-                            grid.remove_entity(current_position)
-                            break
-
-                        # if the entity is not a Zombie neither a Tracking Zombie
-                        # but is also not None means the first entity in the
-                        # firing direction is not a Zombie
-                        # print the ‘No zombie in that direction!’ message
-                        # and break out of loop
-                        elif entity != None:
-                            print(NO_ZOMBIE_MESSAGE)
-                            break
+
+                        # only the first entity can be hit
+                        break
+
+                    # if the edge of the grid was reached without finding
+                    # an entity print the ‘No zombie in that direction!’ message
+                    else:
+                        print(NO_ZOMBIE_MESSAGE)
 
             # if the player does not have crossbow in inventory
             else:
@@ -1634,7 +1929,7 @@ def main():
 
     # validating the precondition for the Game constructor
     # that a player must exist in the grid
-    if grid.find_player() == None:
+    if grid.find_player() is None:
         raise ValueError
 
     #  creating a new game from grid instance  
@@ -74,6 +74,8 @@ class Position:
         4
     """
 
+    __slots__ = ("_x", "_y")
+
     def __init__(self, x: int, y: int):
         """
         The position class is constructed from the x and y coordinate which the
@@ -602,6 +602,53 @@ class TestGridSample(TestGrid):
         }
         self.assertDictEqual(self._grid.serialize(), expected)
 
+    def test_add_abstract_entity(self):
+        """ Test an abstract entity can be added but not serialized """
+        entity = self.a2.Entity()
+        self._grid.add_entity(self._top_left, entity)
+        self.assertIs(self._grid.get_entity(self._top_left), entity)
+        with self.assertRaises(NotImplementedError):
+            self._grid.serialize()
+        self._grid.add_entity(self._top_left, self._player)
+        self.assertDictEqual(self._grid.serialize(), {(0, 0): "P"})
+
+    def test_find_player_two_players(self):
+        """ Test find_player returns the first of two players in the grid """
+        self._grid.add_entity(self._top_left, self._player)
+        self._grid.add_entity(self._bottom_right, self.a2.Player())
+        self.assertEqual(self._grid.find_player(), self._top_left)
+        self._grid.remove_entity(self._bottom_right)
+        self.assertEqual(self._grid.find_player(), self._top_left)
+        self._grid.add_entity(self._bottom_right, self.a2.Player())
+        self._grid.remove_entity(self._top_left)
+        self.assertEqual(self._grid.find_player(), self._bottom_right)
+        self._grid.remove_entity(self._bottom_right)
+        self.assertIsNone(self._grid.find_player())
+
+    def test_has_hospital(self):
+        """ Test has_hospital follows hospitals added and removed """
+        self.assertFalse(self._grid.has_hospital())
+        self._grid.add_entity(self._top_left, self._hospital)
+        self.assertTrue(self._grid.has_hospital())
+        self._grid.remove_entity(self._top_left)
+        self.assertFalse(self._grid.has_hospital())
+
+    def test_ray(self):
+        """ Test ray yields occupied cells nearest first up to the edge """
+        self._grid.add_entity(self._top_right, self._hospital)
+        self._grid.add_entity(self._top_left, self._player)
+        right = self.a2_support.Position(1, 0)
+        down = self.a2_support.Position(0, 1)
+        self.assertListEqual(list(self._grid.ray(self._top_left, right)),
+                             [(3, 0, self._hospital)])
+        self.assertListEqual(list(self._grid.ray(self._bottom_left, right)),
+                             [])
+        self.assertListEqual(list(self._grid.ray(self._top_right, down)), [])
+        still = self.a2_support.Position(0, 0)
+        self.assertListEqual(list(self._grid.ray(self._top_left, still)), [])
+        self.assertListEqual(list(self._grid.ray(self._bottom_left, still)),
+                             [])
+
 
 @skipIfFailed(TestDesign,
               TestDesign.test_classes_and_functions_defined_task_1.__name__,
@@ -695,6 +742,18 @@ class TestGameSample(TestGameTask1):
             self.assertEqual(self._game.get_steps(), i)
             self._game.step()
 
+    def test_step_overridden_entity(self):
+        """ Test step calls step of entities that override it """
+        stepped = []
+
+        class SteppingHospital(self.a2.Hospital):
+            def step(self, position, game):
+                stepped.append(position)
+
+        self._grid.add_entity(self._position2, SteppingHospital())
+        self._game.step()
+        self.assertListEqual(stepped, [self._position2])
+
     def test_move_player(self):
         """ Test moving the player """
         self.assertIsNone(self._game.move_player(self.a2_support.Position(2, 2)))
@@ -802,6 +861,27 @@ class TestTextInterface(TestTextInterfaceRoot):
 
         self.assertMultiLineEqual(stdio.stdout, expected)
 
+    def test_draw_size_differs_from_grid(self):
+        """ Test drawing fits the grid to the size of the interface """
+        expected = "####\n" \
+                   "#  #\n" \
+                   "# P#\n" \
+                   "####\n" \
+                   "#########\n" \
+                   "#       #\n" \
+                   "# P     #\n" \
+                   "#       #\n" \
+                   "#       #\n" \
+                   "#    H  #\n" \
+                   "#       #\n" \
+                   "#       #\n" \
+                   "#########\n"
+        with RedirectStdIO(stdout=True) as stdio:
+            self.a2.TextInterface(2).draw(self._game)
+            self.a2.TextInterface(7).draw(self._game)
+
+        self.assertMultiLineEqual(stdio.stdout, expected)
+
     def test_handle_action_move_up_player_correct_position(self):
         """ Test handling action of player moving up and positioning player correctly """
         self.assertIsNone(self._interface.handle_action(self._game, "W"))
@@ -1366,6 +1446,41 @@ class TestInventory(TestInventoryRoot):
         self.assertTrue(self._inventory.contains("G"))
         self.assertFalse(self._inventory.contains("C"))
 
+    def test_contains_after_expiry(self):
+        """ Test inventory no longer contains an item after it expires """
+        self._inventory.add_item(self._crossbow)
+        self._inventory.add_item(self.a2.Crossbow())
+        self._inventory.add_item(self._garlic)
+        for _ in range(5):
+            self.assertTrue(self._inventory.contains("C"))
+            self._inventory.step()
+        self.assertFalse(self._inventory.contains("C"))
+        self.assertTrue(self._inventory.contains("G"))
+
+    def test_items_changed_directly(self):
+        """ Test inventory follows items added through get_items """
+        self._inventory.add_item(self._garlic)
+        self._inventory.get_items().append(self._crossbow)
+        self.assertTrue(self._inventory.contains("C"))
+        for _ in range(5):
+            self.assertIsNone(self._inventory.step())
+        self.assertFalse(self._inventory.contains("C"))
+        self.assertTrue(self._inventory.contains("G"))
+        self.assertListEqual(self._inventory.get_items(), [self._garlic])
+
+    def test_items_replaced_directly(self):
+        """ Test inventory follows items replaced through get_items """
+        self._inventory.add_item(self._garlic)
+        self._inventory.add_item(self._crossbow)
+        self._inventory.get_items().pop()
+        self._inventory.get_items().append(self.a2.Garlic())
+        self.assertFalse(self._inventory.contains("C"))
+        self._inventory.get_items()[0] = self.a2.Crossbow()
+        self.assertTrue(self._inventory.contains("C"))
+        self.assertTrue(self._inventory.contains("G"))
+        self._inventory.get_items()[1] = self.a2.Crossbow()
+        self.assertFalse(self._inventory.contains("G"))
+
     def test_step(self):
         """ Test step decreases inventory item's lifetime """
         self._inventory.add_item(self._crossbow)
@@ -1375,6 +1490,17 @@ class TestInventory(TestInventoryRoot):
             self.assertEqual(self._garlic.get_lifetime(), 10 - i)
             self.assertIsNone(self._inventory.step())
 
+    def test_step_expire_consecutive(self):
+        """ Test step removes consecutive expired items without skipping """
+        crossbow2 = self.a2.Crossbow()
+        self._inventory.add_item(self._crossbow)
+        self._inventory.add_item(crossbow2)
+        self._inventory.add_item(self._garlic)
+        for _ in range(5):
+            self._inventory.step()
+        self.assertListEqual(self._inventory.get_items(), [self._garlic])
+        self.assertEqual(self._garlic.get_lifetime(), 5)
+
 
 @skipIfFailed(TestDesign,
               TestDesign.test_classes_and_functions_defined_task_3.__name__,